@@ -0,0 +1,172 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled version of TrackGenerator's stepping rules.
+
+Build it in place with `python setup.py build_ext --inplace`, index.py picks it
+up when it's there (set USE_CYTHON=0 to ignore it).
+"""
+from libc.math cimport cos, sin, fabs, fmod, copysign, M_PI
+import numpy as np
+cimport numpy as cnp
+
+cdef double DEG2RAD = M_PI / 180.0
+# Same margin as index._CLAMP_MARGIN
+cdef double CLAMP_MARGIN = 1e-9
+
+
+cdef inline double normalize_angle(double angle) noexcept nogil:
+    """Normalize angle between -180 and 180 degrees.
+
+    Same result as Python's (angle + 180.0) % 360.0 - 180.0, without its checks.
+    """
+    cdef double a = fmod(angle + 180.0, 360.0)
+    if a < 0.0:
+        a += 360.0
+    return a - 180.0
+
+
+cdef class TrackCore:
+    """Steps a TrackGenerator's track with the same rules and pre-drawn random numbers.
+
+    Points are written straight into the generator's point buffer.
+    """
+    cdef readonly double cx, cy
+    cdef double cur_angle, target_angle, pa0, pa1, pa2, step_length, init_dir, limit
+    cdef double turn_inc
+    cdef bint turning
+    cdef int n, num_points, first_turn_gap, until_turn, turn_left
+    cdef int noise_i, turn_i, small_i, big_i
+    cdef const double[:] noise, turn_type, small_turns, big_turns
+    cdef const cnp.int64_t[:] next_turn_gap, big_turn_steps
+    cdef double[:, :] xy
+
+    def __init__(self, gen):
+        self.noise = gen._noise
+        self.turn_type = gen._turn_type
+        self.small_turns = gen._small_turns
+        self.big_turns = gen._big_turns
+        self.next_turn_gap = gen._next_turn_gap
+        self.big_turn_steps = gen._big_turn_steps
+        self.xy = gen._xy
+        self.num_points = gen.num_points
+        self.first_turn_gap = gen._first_turn_gap
+        self.step_length = gen.step_length
+        self.init_dir = gen.initial_direction
+        self.limit = gen._backtrack_limit
+        self.reset()
+
+    cpdef reset(self):
+        """Go back to the start of the track."""
+        self.cx = self.cy = 0.0
+        self.xy[0, 0] = self.xy[0, 1] = 0.0
+        self.n = 1
+        self.cur_angle = self.target_angle = 0.0
+        self.pa0 = self.pa1 = self.pa2 = 0.0
+        self.turning = False
+        self.turn_left = 0
+        self.turn_inc = 0.0
+        self.until_turn = self.first_turn_gap
+        self.noise_i = self.turn_i = self.small_i = self.big_i = 0
+
+    cdef inline void add_to_history(self, double angle) noexcept nogil:
+        self.cur_angle = angle
+        self.pa0 = self.pa1
+        self.pa1 = self.pa2
+        self.pa2 = angle
+
+    cdef inline bint would_cause_backtrack(self, double proposed_angle) noexcept nogil:
+        return fabs(normalize_angle(proposed_angle - self.init_dir)) > self.limit
+
+    cdef inline double get_safe_turn_angle(self, double desired_angle) noexcept nogil:
+        cdef double over = normalize_angle(self.cur_angle + desired_angle - self.init_dir)
+        if fabs(over) <= self.limit:
+            return desired_angle
+        return normalize_angle(self.init_dir + copysign(self.limit - CLAMP_MARGIN, over) - self.cur_angle)
+
+    cdef inline void start_big_turn(self) noexcept nogil:
+        cdef double big_turn_angle = self.get_safe_turn_angle(self.big_turns[self.big_i])
+        cdef int turn_total_steps = <int>self.big_turn_steps[self.big_i]
+        self.big_i += 1
+        self.target_angle = normalize_angle(self.cur_angle + big_turn_angle)
+        self.turn_left = turn_total_steps
+        self.turn_inc = normalize_angle(self.target_angle - self.cur_angle) / turn_total_steps
+        self.turning = True
+
+    cdef inline void step_turn(self) noexcept nogil:
+        cdef double new_angle
+        if self.turn_left > 0:
+            new_angle = self.cur_angle + self.turn_inc
+            if not self.would_cause_backtrack(new_angle):
+                self.add_to_history(normalize_angle(new_angle))
+                self.turn_left -= 1
+            else:
+                # End the turn early rather than backtrack
+                self.turning = False
+                self.turn_left = 0
+        else:
+            self.turning = False
+            self.target_angle = self.cur_angle
+
+    cdef bint step(self) noexcept nogil:
+        """Add the next point, return whether it starts a turn."""
+        cdef bint turn_flag = False
+        cdef double proposed_angle, safe_turn_angle, rad
+        cdef int turn
+        if self.turning:
+            self.step_turn()
+        elif self.until_turn > 0:
+            # Small noise around the smoothed angle
+            self.until_turn -= 1
+            proposed_angle = (self.pa0 + self.pa1 + self.pa2) * 0.3333333333333333 + self.noise[self.noise_i]
+            self.noise_i += 1
+            if not self.would_cause_backtrack(proposed_angle):
+                self.add_to_history(normalize_angle(proposed_angle))
+        else:
+            # Time for next turn
+            turn = self.turn_i
+            self.turn_i += 1
+            self.until_turn = <int>self.next_turn_gap[turn]
+            if self.turn_type[turn] < 0.85:
+                safe_turn_angle = self.get_safe_turn_angle(self.small_turns[self.small_i])
+                self.small_i += 1
+                self.add_to_history(normalize_angle(self.cur_angle + safe_turn_angle))
+                turn_flag = fabs(safe_turn_angle) > 0.5
+            else:
+                self.start_big_turn()
+                turn_flag = True
+
+        # Move forward by step length
+        rad = self.cur_angle * DEG2RAD
+        self.cx += cos(rad) * self.step_length
+        self.cy += sin(rad) * self.step_length
+        self.xy[self.n, 0] = self.cx
+        self.xy[self.n, 1] = self.cy
+        self.n += 1
+        return turn_flag
+
+    def generate_next_point(self):
+        """Add the next point, return (x, y, turn_flag)."""
+        if self.n > self.num_points:
+            raise IndexError("the track already has all its points")
+        cdef bint turn_flag = self.step()
+        return self.cx, self.cy, turn_flag
+
+    def generate_points(self, unsigned char[:] is_turn):
+        """Add the next len(is_turn) points, is_turn[i] is set to 1 when the i-th starts a turn."""
+        cdef int i, count = is_turn.shape[0]
+        if self.n + count > self.num_points + 1:
+            raise IndexError("the track doesn't have that many points left")
+        # The loop touches no Python objects, so it lets other threads (Tk) run meanwhile
+        with nogil:
+            for i in range(count):
+                is_turn[i] = self.step()
+
+    def generate_full_track(self, unsigned char[:] is_turn):
+        """Generate the whole track from the start, return its (num_points + 1, 2) points.
+
+        is_turn[i] is set to 1 when step i starts a turn.
+        """
+        if is_turn.shape[0] < self.num_points:
+            raise ValueError("is_turn needs one entry per step")
+        self.reset()
+        self.generate_points(is_turn[:self.num_points])
+        return np.asarray(self.xy)
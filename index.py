@@ -1,33 +1,201 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
+from collections import deque
+import threading
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import math
+import hashlib
+import os
+from math import copysign, cos, sin, pi
 import random
 import numpy as np
 
+# Long full tracks are drawn as one simplified path
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+try:
+    import numba
+except ImportError:  # numba is optional, without it the generator steps in plain Python
+    numba = None
+
+# The Cython core is optional too, build it with `python setup.py build_ext --inplace`.
+# Set USE_CYTHON=0 to leave it out even when it's built
+TrackCore = None
+if os.environ.get('USE_CYTHON', '1') != '0':
+    try:
+        from _track_core import TrackCore
+    except ImportError:
+        pass
+
+
+_DEG2RAD = pi / 180.0
+# Clamped turns stop this far (in degrees) inside the backtrack limit, so rounding
+# along the turn can never tip them over it
+_CLAMP_MARGIN = 1e-9
+
+
+def _jit(func):
+    """Compile func with numba when it is installed, otherwise leave it as is."""
+    return numba.njit(cache=True)(func) if numba is not None else func
+
+
+def _rng_seed(seed):
+    """Turn a seed (int or any string) into one np.random.default_rng accepts."""
+    if isinstance(seed, int) and seed >= 0:
+        return seed
+    return int(hashlib.blake2b(str(seed).encode(), digest_size=8).hexdigest(), 16)
+
+
+# Slots of the float64 state vector stepped by step_core
+_S_X, _S_Y = 0, 1
+_S_ANGLE, _S_TARGET = 2, 3
+_S_TURNING, _S_TURN_LEFT, _S_TURN_INC = 4, 5, 6
+_S_UNTIL_TURN = 7
+_S_INITIAL, _S_LIMIT = 8, 9
+_S_STEP_LENGTH = 10
+_S_NOISE_I, _S_TURN_I, _S_SMALL_I, _S_BIG_I = 11, 12, 13, 14  # Cursors into the draws
+_S_HISTORY = 15  # Last 3 angles, oldest first
+_STATE_SIZE = _S_HISTORY + 3
+
+
+@_jit
+def _normalize_core(angle):
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+@_jit
+def _backtracks_core(state, proposed_angle):
+    """Same check as TrackGenerator.would_cause_backtrack."""
+    return abs(_normalize_core(proposed_angle - state[_S_INITIAL])) > state[_S_LIMIT]
+
+
+@_jit
+def _safe_turn_core(state, desired_angle):
+    """Same clamp as TrackGenerator.get_safe_turn_angle."""
+    limit = state[_S_LIMIT]
+    over = _normalize_core(state[_S_ANGLE] + desired_angle - state[_S_INITIAL])
+    if abs(over) <= limit:
+        return desired_angle
+    clamped = state[_S_INITIAL] + copysign(limit - _CLAMP_MARGIN, over)
+    return _normalize_core(clamped - state[_S_ANGLE])
+
+
+@_jit
+def _push_angle_core(state, angle):
+    """Set the current angle and add it to the history."""
+    state[_S_ANGLE] = angle
+    state[_S_HISTORY] = state[_S_HISTORY + 1]
+    state[_S_HISTORY + 1] = state[_S_HISTORY + 2]
+    state[_S_HISTORY + 2] = angle
+
+
+@_jit
+def step_core(state, noise, next_turn_gap, turn_type, small_turns, big_turns, big_turn_steps):
+    """Advance the generator state by one step, in place.
+
+    Follows the same rules as TrackGenerator.generate_next_point, reading its
+    random numbers from the generator's pre-drawn arrays.
+    Returns (x, y, angle, turn_flag).
+    """
+    turn_flag = False
+    if state[_S_TURNING] != 0:
+        # Continue smooth big turn
+        if state[_S_TURN_LEFT] > 0:
+            new_angle = state[_S_ANGLE] + state[_S_TURN_INC]
+            if not _backtracks_core(state, new_angle):
+                _push_angle_core(state, _normalize_core(new_angle))
+                state[_S_TURN_LEFT] -= 1
+            else:
+                state[_S_TURNING] = 0
+                state[_S_TURN_LEFT] = 0
+        else:
+            state[_S_TURNING] = 0
+            state[_S_TARGET] = state[_S_ANGLE]
+    elif state[_S_UNTIL_TURN] > 0:
+        # Small noise around the smoothed angle
+        state[_S_UNTIL_TURN] -= 1
+        i = int(state[_S_NOISE_I])
+        state[_S_NOISE_I] += 1
+        smoothed_angle = (state[_S_HISTORY] + state[_S_HISTORY + 1] + state[_S_HISTORY + 2]) * 0.3333333333333333
+        proposed_angle = smoothed_angle + noise[i]
+        if not _backtracks_core(state, proposed_angle):
+            _push_angle_core(state, _normalize_core(proposed_angle))
+    else:
+        # Time for next turn
+        turn = int(state[_S_TURN_I])
+        state[_S_TURN_I] += 1
+        state[_S_UNTIL_TURN] = next_turn_gap[turn]
+        if turn_type[turn] < 0.85:
+            i = int(state[_S_SMALL_I])
+            state[_S_SMALL_I] += 1
+            safe_turn_angle = _safe_turn_core(state, small_turns[i])
+            _push_angle_core(state, _normalize_core(state[_S_ANGLE] + safe_turn_angle))
+            turn_flag = abs(safe_turn_angle) > 0.5
+        else:
+            i = int(state[_S_BIG_I])
+            state[_S_BIG_I] += 1
+            big_turn_angle = _safe_turn_core(state, big_turns[i])
+            state[_S_TARGET] = _normalize_core(state[_S_ANGLE] + big_turn_angle)
+            turn_total_steps = big_turn_steps[i]
+            state[_S_TURN_LEFT] = turn_total_steps
+            state[_S_TURN_INC] = _normalize_core(state[_S_TARGET] - state[_S_ANGLE]) / turn_total_steps
+            state[_S_TURNING] = 1
+            turn_flag = True
+
+    # Move forward by step length
+    rad = state[_S_ANGLE] * _DEG2RAD
+    state[_S_X] += cos(rad) * state[_S_STEP_LENGTH]
+    state[_S_Y] += sin(rad) * state[_S_STEP_LENGTH]
+    return state[_S_X], state[_S_Y], state[_S_ANGLE], turn_flag
+
+
+if numba is not None and TrackCore is None:
+    # Compile once up front so live generation doesn't stall on its first step
+    # (with the Cython core loaded step_core is never called)
+    step_core(np.zeros(_STATE_SIZE), np.zeros(1), np.zeros(1, dtype=np.int64), np.zeros(1),
+              np.zeros(1), np.zeros(1), np.zeros(1, dtype=np.int64))
+
+
 class TrackGenerator:
     def __init__(self, seed, step_length=10, num_points=200, num_stations=5):
         self.seed = seed
-        self.random = random.Random(seed)
+        self.random = random.Random(seed)  # Only used to place stations
         self.step_length = step_length
         self.num_points = num_points
         self.num_stations = num_stations
 
-        # Track state
-        self.current_position = (0, 0)
-        self.track_points = [self.current_position]
+        # Track state, current position is (self._cx, self._cy)
+        self._cx = self._cy = 0.0
+        # Points are written into a preallocated buffer, self._n of them are filled
+        self._xy = np.empty((num_points + 1, 2), dtype=np.float64)
+        self._xy[0] = self.current_position
+        self._n = 1
 
         # Angles in degrees
         self.current_direction_angle = 0  # start pointing right (0 deg)
         self.target_direction_angle = 0  # for smooth turns
-        self.previous_angles = [0] * 5  # Keep history for smoothing
+        # Last 3 angles for smoothing, oldest first
+        self._a0 = self._a1 = self._a2 = 0.0
         
         # Track the general forward direction to prevent backtracking
         self.initial_direction = 0  # Starting direction
         self.cumulative_turn = 0  # Track total turning to prevent loops
 
-        self.steps_until_next_turn = self.random.randint(20, 50)
+        # Draw every random number the track needs up front, each kind of draw
+        # is read in order through its own cursor
+        rng = np.random.default_rng(_rng_seed(seed))
+        max_turns = num_points // 31 + 2  # Turns are always at least 31 steps apart
+        self._noise = rng.uniform(-1.0, 1.0, num_points)
+        self._first_turn_gap = int(rng.integers(20, 51))
+        self._next_turn_gap = rng.integers(30, 71, max_turns)
+        self._turn_type = rng.random(max_turns)
+        self._small_turns = rng.uniform(2, 15, max_turns) * rng.choice([-1.0, 1.0], max_turns)
+        self._big_turns = rng.uniform(20, 50, max_turns) * rng.choice([-1.0, 1.0], max_turns)
+        self._big_turn_steps = rng.integers(15, 31, max_turns)
+        self._noise_i = self._turn_i = self._small_i = self._big_i = 0
+
+        self.steps_until_next_turn = self._first_turn_gap
         self.turn_indices = []
         self.station_indices = []  # Track which points are stations
 
@@ -40,6 +208,43 @@ class TrackGenerator:
         self.max_turn_angle = 60  # Reduced maximum turn angle
         self.max_cumulative_turn = 120  # Maximum total turn from initial direction
         self.backtrack_threshold = 120  # Angle threshold to consider backtracking
+        # Both limits apply to the same angle, so only the tighter one matters
+        self._backtrack_limit = min(self.backtrack_threshold, self.max_cumulative_turn)
+
+        # With the Cython core, generate_next_point and generate_full_track run
+        # in it, failing that generate_next_point steps a packed state with numba
+        self.core = TrackCore(self) if TrackCore is not None else None
+        self.state = None
+        if self.core is None and numba is not None:
+            self.state = self.pack_state()
+
+    def pack_state(self):
+        """Return the generator state as a float64 vector for step_core."""
+        state = np.zeros(_STATE_SIZE)
+        state[_S_X], state[_S_Y] = self.current_position
+        state[_S_ANGLE] = self.current_direction_angle
+        state[_S_TARGET] = self.target_direction_angle
+        state[_S_TURNING] = self.turning
+        state[_S_TURN_LEFT] = self.turn_steps_remaining
+        state[_S_TURN_INC] = self.turn_angle_increment
+        state[_S_UNTIL_TURN] = self.steps_until_next_turn
+        state[_S_INITIAL] = self.initial_direction
+        state[_S_LIMIT] = self._backtrack_limit
+        state[_S_STEP_LENGTH] = self.step_length
+        state[_S_NOISE_I], state[_S_TURN_I] = self._noise_i, self._turn_i
+        state[_S_SMALL_I], state[_S_BIG_I] = self._small_i, self._big_i
+        state[_S_HISTORY:] = self._a0, self._a1, self._a2
+        return state
+
+    @property
+    def current_position(self):
+        """The last point generated, as an (x, y) tuple."""
+        return (self._cx, self._cy)
+
+    @property
+    def track_points(self):
+        """The points generated so far, as an (n, 2) array."""
+        return self._xy[:self._n]
 
     def calculate_station_positions(self):
         """Calculate approximate positions for train stations with some variation."""
@@ -70,60 +275,44 @@ class TrackGenerator:
         return station_positions
 
     def normalize_angle(self, angle):
-        """Normalize angle between -180 and 180 degrees."""
-        while angle > 180:
-            angle -= 360
-        while angle < -180:
-            angle += 360
-        return angle
+        """Normalize angle between -180 and 180 degrees (also works on arrays)."""
+        return (angle + 180.0) % 360.0 - 180.0
 
     def get_smoothed_angle(self):
         """Return a smoothed angle based on recent history."""
-        return np.mean(self.previous_angles[-3:])  # Average last 3 angles
+        return (self._a0 + self._a1 + self._a2) * 0.3333333333333333  # Average last 3 angles
+
+    def add_to_history(self, angle):
+        """Record a new direction angle for smoothing."""
+        self._a0 = self._a1
+        self._a1 = self._a2
+        self._a2 = angle
 
     def would_cause_backtrack(self, proposed_angle):
         """Check if a proposed angle would cause backtracking."""
-        # Calculate angle difference from initial direction
-        angle_from_initial = abs(self.normalize_angle(proposed_angle - self.initial_direction))
-        
-        # If we're more than 120 degrees from initial direction, it's backtracking
-        if angle_from_initial > self.backtrack_threshold:
-            return True
-            
-        # Also check if cumulative turn is too much
-        total_turn_from_initial = abs(self.normalize_angle(proposed_angle - self.initial_direction))
-        if total_turn_from_initial > self.max_cumulative_turn:
-            return True
-            
-        return False
+        # Turning further from the initial direction than the limit is backtracking
+        return abs(self.normalize_angle(proposed_angle - self.initial_direction)) > self._backtrack_limit
 
-    def get_safe_turn_angle(self, desired_angle):
+    def get_safe_turn_angle(self, desired_angle, current_angle=None):
         """Return a safe turn angle that won't cause backtracking."""
-        proposed_angle = self.normalize_angle(self.current_direction_angle + desired_angle)
-        
-        # If proposed angle would cause backtracking, reduce it
-        if self.would_cause_backtrack(proposed_angle):
-            # Try reducing the angle
-            safe_angle = desired_angle * 0.3  # Reduce to 30% of original
-            proposed_angle = self.normalize_angle(self.current_direction_angle + safe_angle)
-            
-            # If still problematic, try opposite direction with small angle
-            if self.would_cause_backtrack(proposed_angle):
-                safe_angle = -desired_angle * 0.2  # Small turn in opposite direction
-                proposed_angle = self.normalize_angle(self.current_direction_angle + safe_angle)
-                
-                # If still problematic, just go straight
-                if self.would_cause_backtrack(proposed_angle):
-                    safe_angle = 0
-                    
-            return safe_angle
-        
-        return desired_angle
+        # Turn from the generator's own heading unless told otherwise
+        if current_angle is None:
+            current_angle = self.current_direction_angle
+
+        # How far from the initial direction the turn would leave us
+        limit = self._backtrack_limit
+        over = self.normalize_angle(current_angle + desired_angle - self.initial_direction)
+        if abs(over) <= limit:
+            return desired_angle
+
+        # Otherwise only turn as far as the limit on that side
+        clamped = self.initial_direction + copysign(limit - _CLAMP_MARGIN, over)
+        return self.normalize_angle(clamped - current_angle)
 
     def start_big_turn(self):
         """Initialize a big smooth turn that won't cause backtracking."""
         # Choose turn angle: between 20 and 50 degrees, with random sign
-        big_turn_angle = self.random.uniform(20, 50) * (1 if self.random.random() < 0.5 else -1)
+        big_turn_angle = self._big_turns[self._big_i]
         
         # Make sure this turn won't cause backtracking
         big_turn_angle = self.get_safe_turn_angle(big_turn_angle)
@@ -132,7 +321,8 @@ class TrackGenerator:
         self.target_direction_angle = self.normalize_angle(self.current_direction_angle + big_turn_angle)
 
         # Smooth turn will take 15 to 30 steps to complete
-        self.turn_total_steps = self.random.randint(15, 30)
+        self.turn_total_steps = int(self._big_turn_steps[self._big_i])
+        self._big_i += 1
         self.turn_steps_remaining = self.turn_total_steps
 
         # Calculate angle increment per step for smooth transition
@@ -141,7 +331,7 @@ class TrackGenerator:
 
         self.turning = True
         # Register turn start index for highlighting
-        self.turn_indices.append(len(self.track_points))
+        self.turn_indices.append(self._n)
 
     def step_turn(self):
         """Perform one step of a smooth big turn."""
@@ -151,7 +341,7 @@ class TrackGenerator:
             # Double-check we're not backtracking during the turn
             if not self.would_cause_backtrack(new_angle):
                 self.current_direction_angle = self.normalize_angle(new_angle)
-                self.previous_angles.append(self.current_direction_angle)
+                self.add_to_history(self.current_direction_angle)
                 self.turn_steps_remaining -= 1
             else:
                 # If we would backtrack, end the turn early
@@ -163,6 +353,30 @@ class TrackGenerator:
             self.target_direction_angle = self.current_direction_angle
 
     def generate_next_point(self):
+        if self.core is not None:
+            # The compiled core writes the point itself
+            x, y, turn_flag = self.core.generate_next_point()
+            if turn_flag:
+                self.turn_indices.append(self._n)
+            self._cx = x
+            self._cy = y
+            self._n += 1
+            return
+
+        if self.state is not None:
+            # Let the compiled core do the step
+            x, y, _, turn_flag = step_core(
+                self.state, self._noise, self._next_turn_gap, self._turn_type,
+                self._small_turns, self._big_turns, self._big_turn_steps)
+            if turn_flag:
+                self.turn_indices.append(self._n)
+            self._cx = x
+            self._cy = y
+            self._xy[self._n, 0] = x
+            self._xy[self._n, 1] = y
+            self._n += 1
+            return
+
         if self.turning:
             # Continue smooth big turn
             self.step_turn()
@@ -171,60 +385,215 @@ class TrackGenerator:
             if self.steps_until_next_turn > 0:
                 self.steps_until_next_turn -= 1
                 # Very small random "noise" to keep it natural but mostly forward
-                noise = self.random.uniform(-1, 1)  # Reduced noise
+                noise = self._noise[self._noise_i]  # Reduced noise
+                self._noise_i += 1
                 smoothed_angle = self.get_smoothed_angle()
                 proposed_angle = smoothed_angle + noise
                 
                 # Check if this small adjustment would cause backtracking
                 if not self.would_cause_backtrack(proposed_angle):
                     self.current_direction_angle = self.normalize_angle(proposed_angle)
-                    self.previous_angles.append(self.current_direction_angle)
+                    self.add_to_history(self.current_direction_angle)
                 # If it would backtrack, just keep the current angle
                 
             else:
                 # Time for next turn
-                self.steps_until_next_turn = self.random.randint(30, 70)
+                self.steps_until_next_turn = int(self._next_turn_gap[self._turn_i])
 
                 # Decide turn type with bias to mostly small turns (85% small turns)
-                turn_type_roll = self.random.random()
+                turn_type_roll = self._turn_type[self._turn_i]
+                self._turn_i += 1
                 if turn_type_roll < 0.85:
                     # Small soft turn (2 to 15 degrees)
-                    small_turn_angle = self.random.uniform(2, 15) * (1 if self.random.random() < 0.5 else -1)
+                    small_turn_angle = self._small_turns[self._small_i]
+                    self._small_i += 1
                     
                     # Get safe turn angle to prevent backtracking
                     safe_turn_angle = self.get_safe_turn_angle(small_turn_angle)
                     
                     self.current_direction_angle += safe_turn_angle
                     self.current_direction_angle = self.normalize_angle(self.current_direction_angle)
-                    self.previous_angles.append(self.current_direction_angle)
+                    self.add_to_history(self.current_direction_angle)
 
                     # Mark this as a turn point only if we actually turned
                     if abs(safe_turn_angle) > 0.5:  # Only mark significant turns
-                        self.turn_indices.append(len(self.track_points))
+                        self.turn_indices.append(self._n)
                 else:
                     # Start a smooth big turn (circle-like)
                     self.start_big_turn()
 
         # Move forward by step length
-        rad = math.radians(self.current_direction_angle)
-        x, y = self.current_position
-        dx = math.cos(rad) * self.step_length
-        dy = math.sin(rad) * self.step_length
-        new_pos = (x + dx, y + dy)
-        self.current_position = new_pos
-        self.track_points.append(new_pos)
+        rad = self.current_direction_angle * _DEG2RAD
+        x = self._cx + cos(rad) * self.step_length
+        y = self._cy + sin(rad) * self.step_length
+        self._cx = x
+        self._cy = y
+        self._xy[self._n, 0] = x
+        self._xy[self._n, 1] = y
+        self._n += 1
+
+    def generate_points(self, count):
+        """Generate up to count more points, fewer at the end of the track.
+
+        Returns the new points as an (n, 2) array and a mask of which of them
+        start a turn.
+        """
+        start = self._n
+        count = max(0, min(count, self.num_points + 1 - start))
+        if self.core is not None:
+            # The compiled core steps the whole batch without holding the GIL
+            is_turn = np.zeros(count, dtype=np.uint8)
+            self.core.generate_points(is_turn)
+            self._cx, self._cy = self.core.cx, self.core.cy
+            self._n += count
+            self.turn_indices.extend((np.flatnonzero(is_turn) + start).tolist())
+            return self._xy[start:self._n], is_turn.view(bool)
+
+        turns = len(self.turn_indices)
+        for _ in range(count):
+            self.generate_next_point()
+        is_turn = np.zeros(count, dtype=bool)
+        is_turn[np.array(self.turn_indices[turns:], dtype=int) - start] = True
+        return self._xy[start:self._n], is_turn
+
+    def _straight_run(self, history, noise, kernel, limit):
+        """Return the headings for a run of noisy straight steps and the new history."""
+        angles = np.empty(len(noise))
+        done = 0
+        while done < len(noise):
+            # Play the rest of the run through the "average of the last 3" smoothing.
+            # The headings from before the run enter as a carry on the first 3 steps.
+            oldest, older, last = history
+            nudges = noise[done:].copy()
+            nudges[:3] += np.array([oldest + older + last, older + last, last])[:len(nudges)] / 3
+            run = np.convolve(nudges, kernel[:len(nudges)])[:len(nudges)]
+
+            # Keep everything up to the first heading that would backtrack
+            drift = np.abs(self.normalize_angle(run - self.initial_direction))
+            bad = np.flatnonzero(drift > limit)
+            end = bad[0] if len(bad) else len(run)
+            angles[done:done + end] = run[:end]
+            history = (history + run[max(0, end - 3):end].tolist())[-3:]
+            done += end
+
+            if done >= len(noise):
+                break
+
+            # That step keeps the current heading and leaves the history alone, so
+            # every step after it starts from the same smoothed heading until a
+            # nudge brings it back inside the limit: find that step in one go
+            angles[done] = history[-1]
+            done += 1
+            proposed = sum(history) / 3 + noise[done:]
+            drift = np.abs(self.normalize_angle(proposed - self.initial_direction))
+            ok = np.flatnonzero(drift <= limit)
+            held = ok[0] if len(ok) else len(proposed)
+            angles[done:done + held] = history[-1]
+            done += held
+        return angles, history
+
+    def _plan_angles(self, num_points):
+        """Plan the heading for every step of the track in one go.
+
+        Follows the same rules as generate_next_point from the start of the track and
+        reads the same pre-drawn random numbers, but fills whole straight runs and
+        smooth turns with NumPy.
+        Returns (angles, turn_indices), where angles[i] is the heading of step i.
+        """
+        noise = self._noise
+        big_turn_steps = self._big_turn_steps
+
+        # How one noise nudge carries through the smoothing on the following steps
+        kernel = np.zeros(max(self._first_turn_gap, self._next_turn_gap.max()) + 1)
+        kernel[0] = 1.0
+        for k in range(1, len(kernel)):
+            kernel[k] = kernel[max(0, k - 3):k].sum() / 3
+
+        limit = self._backtrack_limit
+        angles = np.empty(num_points)
+        turn_indices = []
+        history = [0.0, 0.0, 0.0]  # Last 3 headings, oldest first
+        step = 0
+        noise_used = turn = small = big = 0
+        steps_until_next_turn = self._first_turn_gap
+
+        while step < num_points:
+            # Straight run with small noise until the next turn
+            run = min(steps_until_next_turn, num_points - step)
+            angles[step:step + run], history = self._straight_run(
+                history, noise[noise_used:noise_used + run], kernel, limit)
+            step += run
+            noise_used += run
+            if step >= num_points:
+                break
+
+            # Time for next turn
+            steps_until_next_turn = self._next_turn_gap[turn]
+            current_angle = history[-1]
+            is_small_turn = self._turn_type[turn] < 0.85
+            turn += 1
+            if is_small_turn:
+                # Small soft turn, applied straight away
+                safe_turn_angle = self.get_safe_turn_angle(self._small_turns[small], current_angle)
+                small += 1
+                current_angle = self.normalize_angle(current_angle + safe_turn_angle)
+                history = history[1:] + [current_angle]
+                angles[step] = current_angle
+                step += 1
+                if abs(safe_turn_angle) > 0.5:  # Only mark significant turns
+                    turn_indices.append(step)
+                continue
+
+            # Smooth big turn: this step still goes straight, then the same
+            # increment is added on each following step
+            big_turn_angle = self.get_safe_turn_angle(self._big_turns[big], current_angle)
+            target_angle = self.normalize_angle(current_angle + big_turn_angle)
+            turn_increment = self.normalize_angle(target_angle - current_angle) / big_turn_steps[big]
+            angles[step] = current_angle
+            step += 1
+            turn_indices.append(step)
+
+            ramp = current_angle + turn_increment * np.arange(1, big_turn_steps[big] + 1)
+            big += 1
+            ramp = ramp[:num_points - step]
+            drift = np.abs(self.normalize_angle(ramp - self.initial_direction))
+            bad = np.flatnonzero(drift > limit)
+            end = bad[0] if len(bad) else len(ramp)
+            angles[step:step + end] = ramp[:end]
+            history = (history + ramp[max(0, end - 3):end].tolist())[-3:]
+            step += end
+
+            # The turn ends (or is cut short) on a step that keeps the heading
+            if step < num_points:
+                angles[step] = history[-1]
+                step += 1
+
+        return angles, np.array(turn_indices, dtype=int)
 
     def generate_full_track(self):
         # Calculate station positions before generating track
         station_positions = self.calculate_station_positions()
-        
-        for step in range(self.num_points):
-            self.generate_next_point()
-            
-            # Check if this step should be a station
-            if step in station_positions:
-                self.station_indices.append(len(self.track_points) - 1)
-        
+
+        if self.core is not None:
+            # The compiled core steps the whole track straight into the point buffer
+            is_turn = np.zeros(self.num_points, dtype=np.uint8)
+            self.core.generate_full_track(is_turn)
+            self.turn_indices = np.flatnonzero(is_turn) + 1
+        else:
+            angles, self.turn_indices = self._plan_angles(self.num_points)
+
+            # Move forward by step length on every heading, straight into the point buffer
+            rad = np.radians(angles)
+            self._xy[0] = 0.0
+            np.cumsum(np.cos(rad) * self.step_length, out=self._xy[1:, 0])
+            np.cumsum(np.sin(rad) * self.step_length, out=self._xy[1:, 1])
+        self._n = self.num_points + 1
+        self._cx, self._cy = self._xy[-1]
+
+        # Each station sits on the point reached at its step
+        stations = np.unique(np.array(station_positions, dtype=int))
+        self.station_indices = stations[stations < self.num_points] + 1
+
         return self.track_points, self.turn_indices, self.station_indices
 
 
@@ -262,6 +631,8 @@ class TrackApp(tk.Tk):
         self.live_btn.pack(side=tk.LEFT, padx=5)
 
         self.stop_live = False
+        self.live_batch = 10  # Points generated per live tick
+        self.live_view_every = 2  # Ticks between moving the live view
 
         # Create two Matplotlib figures side by side
         fig_frame = ttk.Frame(self)
@@ -282,22 +653,32 @@ class TrackApp(tk.Tk):
         self.ax_live.grid(True)
         self.canvas_live = FigureCanvasTkAgg(self.fig_live, master=fig_frame)
         self.canvas_live.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Whenever the live view is fully redrawn (new view, resize), save it for blitting
+        self.canvas_live.mpl_connect('draw_event', self.on_live_draw)
 
         # Initialize variables for live generation
+        # Points, turns and stations are written into preallocated (n, 2) arrays,
+        # with a count of how many rows are filled
         self.track_gen = None
-        self.live_points_x = []
-        self.live_points_y = []
-        self.live_turns_x = []
-        self.live_turns_y = []
-        self.live_stations_x = []
-        self.live_stations_y = []
+        self.live_xy = np.zeros((1, 2))
+        self.live_n = 1
+        self.live_turns_xy = np.zeros((0, 2))
+        self.live_turns_n = 0
+        self.live_stations_xy = np.zeros((0, 2))
+        self.live_stations_n = 0
+        self.live_artists = ()
+        self.live_background = None
+        # Live points are generated on a background thread and handed over in a deque
+        self.live_queue = deque()
+        self.live_stop = threading.Event()
 
     def generate_random_seed(self):
         """Generate a random seed and update the seed entry."""
         random_seed = random.randint(0, 999999999)
         self.seed_var.set(str(random_seed))
 
-    def generate_full_track(self):
+    def create_track_generator(self):
+        """Build a TrackGenerator from the controls, or show the error and return None."""
         try:
             seed = self.seed_var.get()
             # Try to convert to int if it's a numeric string
@@ -305,127 +686,180 @@ class TrackApp(tk.Tk):
                 seed = int(seed)
             except ValueError:
                 pass  # Keep as string if not numeric
-            
-            length = self.length_var.get()
-            num_stations = self.stations_var.get()
-            self.track_gen = TrackGenerator(seed, step_length=10, num_points=length, num_stations=num_stations)
-            points, turn_indices, station_indices = self.track_gen.generate_full_track()
-
-            xs, ys = zip(*points)
-            self.ax_full.clear()
-
-            # Plot track
-            self.ax_full.plot(xs, ys, marker='o', linestyle='-', color='blue', markersize=3, label='Track Path')
-
-            # Highlight turns
-            if turn_indices:
-                turn_x = [points[i][0] for i in turn_indices]
-                turn_y = [points[i][1] for i in turn_indices]
-                self.ax_full.scatter(turn_x, turn_y, color='orange', s=40, label='Turns')
-
-            # Highlight train stations
-            if station_indices:
-                station_x = [points[i][0] for i in station_indices]
-                station_y = [points[i][1] for i in station_indices]
-                self.ax_full.scatter(station_x, station_y, color='red', s=100, marker='s', label='Train Stations')
-
-            # Set zoomed out limits with margin
-            margin = 100
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
-            self.ax_full.set_xlim(min_x - margin, max_x + margin)
-            self.ax_full.set_ylim(min_y - margin, max_y + margin)
-
-            self.ax_full.set_title(f"Track with {num_stations} Stations (Seed={seed}, Length={length})")
-            self.ax_full.set_aspect('equal')
-            self.ax_full.grid(True)
-            self.ax_full.legend()
-            self.canvas_full.draw()
-        except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-    def start_live_generation(self):
-        # Reset live view
-        self.stop_live = False
-        try:
-            seed = self.seed_var.get()
-            # Try to convert to int if it's a numeric string
-            try:
-                seed = int(seed)
-            except ValueError:
-                pass  # Keep as string if not numeric
-                
             length = self.length_var.get()
             num_stations = self.stations_var.get()
-            self.track_gen = TrackGenerator(seed, step_length=10, num_points=length, num_stations=num_stations)
-
-            # Pre-calculate station positions for live view
-            self.station_positions = self.track_gen.calculate_station_positions()
-
-            self.live_points_x = [0]
-            self.live_points_y = [0]
-            self.live_turns_x = []
-            self.live_turns_y = []
-            self.live_stations_x = []
-            self.live_stations_y = []
-
-            self.ax_live.clear()
-            self.ax_live.set_title("Zoomed-In Live Generation")
-            self.ax_live.set_aspect('equal')
-            self.ax_live.grid(True)
-
-            self.live_step(0)
+            return TrackGenerator(seed, step_length=10, num_points=length, num_stations=num_stations)
         except Exception as e:
-            tk.messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            return None
 
-    def live_step(self, step_count):
-        if self.stop_live or step_count >= self.track_gen.num_points:
+    def generate_full_track(self):
+        # Bad input leaves the current generator (and any live run using it) alone
+        track_gen = self.create_track_generator()
+        if track_gen is None:
             return
+        self.track_gen = track_gen
+
+        seed = self.track_gen.seed
+        length = self.track_gen.num_points
+        num_stations = self.track_gen.num_stations
+        points, turn_indices, station_indices = self.track_gen.generate_full_track()
+
+        self.ax_full.clear()
+
+        # Plot track
+        self.ax_full.plot(points[:, 0], points[:, 1], linestyle='-', color='blue', linewidth=1, solid_joinstyle='round', label='Track Path')
+
+        # Highlight turns
+        if len(turn_indices):
+            turn_x = points[turn_indices, 0]
+            turn_y = points[turn_indices, 1]
+            self.ax_full.scatter(turn_x, turn_y, color='orange', s=40, label='Turns')
+
+        # Highlight train stations
+        if len(station_indices):
+            station_x = points[station_indices, 0]
+            station_y = points[station_indices, 1]
+            self.ax_full.scatter(station_x, station_y, color='red', s=100, marker='s', label='Train Stations')
+
+        # Set zoomed out limits with margin
+        margin = 100
+        mins = points.min(axis=0)
+        maxs = points.max(axis=0)
+        self.ax_full.set_xlim(mins[0] - margin, maxs[0] + margin)
+        self.ax_full.set_ylim(mins[1] - margin, maxs[1] + margin)
+
+        self.ax_full.set_title(f"Track with {num_stations} Stations (Seed={seed}, Length={length})")
+        self.ax_full.set_aspect('equal')
+        self.ax_full.grid(True)
+        self.ax_full.legend()
+        self.canvas_full.draw_idle()
 
-        # Generate next point
-        self.track_gen.generate_next_point()
-        x, y = self.track_gen.current_position
-        self.live_points_x.append(x)
-        self.live_points_y.append(y)
-
-        # Check if this step should be a station
-        if step_count in self.station_positions:
-            self.live_stations_x.append(x)
-            self.live_stations_y.append(y)
-
-        # Check if last point was a turn (using stored indices)
-        if len(self.track_gen.turn_indices) > 0 and self.track_gen.turn_indices[-1] == len(self.live_points_x) - 1:
-            self.live_turns_x.append(x)
-            self.live_turns_y.append(y)
-
-        self.ax_live.clear()
+    def start_live_generation(self):
+        # Bad input leaves the current generator (and any live run using it) alone
+        track_gen = self.create_track_generator()
+        if track_gen is None:
+            return
+        self.track_gen = track_gen
 
-        # Plot path so far
-        self.ax_live.plot(self.live_points_x, self.live_points_y, marker='o', linestyle='-', color='blue', markersize=5, label='Track Path')
+        # Reset live view, and stop the producer of any previous live track
+        self.stop_live = False
+        self.live_stop.set()
 
-        # Plot turns in orange
-        if self.live_turns_x:
-            self.ax_live.scatter(self.live_turns_x, self.live_turns_y, color='orange', s=60, label='Turns')
+        length = self.track_gen.num_points
 
-        # Plot stations in red squares
-        if self.live_stations_x:
-            self.ax_live.scatter(self.live_stations_x, self.live_stations_y, color='red', s=120, marker='s', label='Train Stations')
+        # Pre-calculate station positions for live view, turns come with the points
+        self.station_positions = self.track_gen.calculate_station_positions()
 
-        # Zoom tightly around current position (with margin)
-        margin = 70
-        cx, cy = x, y
-        self.ax_live.set_xlim(cx - margin, cx + margin)
-        self.ax_live.set_ylim(cy - margin, cy + margin)
+        self.live_xy = np.empty((length + 1, 2))
+        self.live_xy[0] = (0, 0)
+        self.live_n = 1
+        # There is at most one turn marker per turn drawn
+        self.live_turns_xy = np.empty((len(self.track_gen._turn_type), 2))
+        self.live_turns_n = 0
+        self.live_stations_xy = np.empty((len(self.station_positions), 2))
+        self.live_stations_n = 0
 
-        self.ax_live.set_title(f"Live Generation (Step {step_count + 1})")
+        self.ax_live.clear()
+        self.ax_live.set_title("Zoomed-In Live Generation")
         self.ax_live.set_aspect('equal')
         self.ax_live.grid(True)
+
+        # Artists are created once, live_step just updates their data and blits them
+        self.live_line, = self.ax_live.plot([], [], marker='o', linestyle='-', color='blue', markersize=5, label='Track Path', animated=True)
+        self.live_turns = self.ax_live.scatter([], [], color='orange', s=60, label='Turns', animated=True)
+        self.live_stations = self.ax_live.scatter([], [], color='red', s=120, marker='s', label='Train Stations', animated=True)
         self.ax_live.legend()
+        self.live_artists = (self.live_line, self.live_turns, self.live_stations)
+        self.live_background = None
+        self.live_tick = self.live_view_tick = 0
+
+        # Generate the points on a background thread, live_step only draws them
+        self.live_queue = deque()
+        self.live_stop = threading.Event()
+        threading.Thread(target=self.produce_live_points,
+                         args=(self.track_gen, self.live_queue, self.live_stop), daemon=True).start()
+
+        self.live_step(self.track_gen, self.station_positions, 0, self.live_stop)
+
+    def produce_live_points(self, track_gen, queue, stop):
+        """Generate every point of track_gen into queue, until done or stop is set.
+
+        Points are queued a batch at a time, with the mask of which of them are turns.
+        """
+        while not stop.is_set():
+            points, is_turn = track_gen.generate_points(self.live_batch)
+            if not len(points):
+                return
+            queue.append((points, is_turn))
+
+    def on_live_draw(self, event):
+        """Save the freshly drawn live view and draw the track on top of it."""
+        self.live_background = self.canvas_live.copy_from_bbox(self.ax_live.bbox)
+        for artist in self.live_artists:
+            self.ax_live.draw_artist(artist)
+
+    def live_step(self, track_gen, station_positions, step_count, stop):
+        # The run keeps its own generator, "Generate Full Track" may replace self.track_gen
+        if stop.is_set() or self.stop_live or step_count >= track_gen.num_points:
+            return
 
-        self.canvas_live.draw()
+        # Take the next batch of generated points, it is all drawn at once below
+        # (deque appends and pops are thread safe, so the producer needs no lock)
+        if not self.live_queue:
+            self.after(40, lambda: self.live_step(track_gen, station_positions, step_count, stop))
+            return
+        points, is_turn = self.live_queue.popleft()
+        count = len(points)
+        self.live_xy[self.live_n:self.live_n + count] = points
+        self.live_n += count
+
+        # Turns as generated, and the points reached at station steps
+        turns = points[is_turn]
+        self.live_turns_xy[self.live_turns_n:self.live_turns_n + len(turns)] = turns
+        self.live_turns_n += len(turns)
+        for station in sorted(set(station_positions)):
+            if step_count <= station < step_count + count:
+                self.live_stations_xy[self.live_stations_n] = points[station - step_count]
+                self.live_stations_n += 1
+
+        step_count += count
+        x, y = points[-1]
+
+        # Zoom tightly around current position (with margin). Moving the view
+        # means redrawing everything behind the track, so only do it every few ticks
+        self.live_tick += 1
+        last_step = step_count >= track_gen.num_points
+        if self.live_background is None or self.live_tick - self.live_view_tick >= self.live_view_every or last_step:
+            # Leave room for the batches drawn before the view moves again
+            margin = 70 + (self.live_view_every - 1) * self.live_batch * track_gen.step_length
+            cx, cy = x, y
+            self.ax_live.set_xlim(cx - margin, cx + margin)
+            self.ax_live.set_ylim(cy - margin, cy + margin)
+            self.ax_live.set_title(f"Live Generation (Step {step_count})")
+            self.live_view_tick = self.live_tick
+            redraw = True
+        else:
+            redraw = False
+
+        # Update path so far, turns in orange and stations in red squares
+        self.live_line.set_data(self.live_xy[:self.live_n, 0], self.live_xy[:self.live_n, 1])
+        self.live_turns.set_offsets(self.live_turns_xy[:self.live_turns_n])
+        self.live_stations.set_offsets(self.live_stations_xy[:self.live_stations_n])
+
+        if redraw:
+            # on_live_draw puts the track on top once Tk gets round to the redraw
+            self.canvas_live.draw_idle()
+        else:
+            # Draw just the track over the saved background
+            self.canvas_live.restore_region(self.live_background)
+            for artist in self.live_artists:
+                self.ax_live.draw_artist(artist)
+            self.canvas_live.blit(self.ax_live.bbox)
 
         # Schedule next step
-        self.after(40, lambda: self.live_step(step_count + 1))
+        self.after(40, lambda: self.live_step(track_gen, station_positions, step_count, stop))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+"""Builds the optional Cython track core: python setup.py build_ext --inplace"""
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+import numpy as np
+
+setup(
+    name="track_core",
+    ext_modules=cythonize(
+        [Extension("_track_core", ["_track_core.pyx"], include_dirs=[np.get_include()])],
+        language_level=3,
+    ),
+)